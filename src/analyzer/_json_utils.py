@@ -0,0 +1,123 @@
+"""Helpers for reading JSON out of LLM responses."""
+
+import json
+import re
+from typing import Any, List
+from langchain_core.messages import BaseMessage
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+try:
+    import json5
+except ImportError:
+    json5 = None
+
+_FENCE_RE = re.compile(r"^\s*```(?:json)?\s*|\s*```\s*$", re.IGNORECASE)
+
+# Shared decoder for the stdlib path; raw_decode parses an object that has text after it
+_JSON_DECODER = json.JSONDecoder()
+
+
+def loads_json(text: str) -> Any:
+    """Parse JSON text, using orjson when installed."""
+    return orjson.loads(text) if orjson is not None else _JSON_DECODER.decode(text)
+
+
+def strip_code_fences(text: str) -> str:
+    """Remove a surrounding markdown code fence (```json ... ```) from text."""
+    return _FENCE_RE.sub('', text).strip()
+
+
+def parse_llm_json(content: str) -> Any:
+    """
+    Parse the JSON object in an LLM response.
+    
+    Tolerates markdown code fences and text before/after the object. Uses orjson when
+    installed and falls back to json5 (if installed) for lenient parsing of trailing
+    commas, single quotes, etc.
+    
+    Args:
+        content: Raw LLM response text
+        
+    Returns:
+        Parsed JSON value
+        
+    Raises:
+        ValueError: If no valid JSON could be parsed
+    """
+    text = strip_code_fences(content)
+    try:
+        return loads_json(text)
+    except ValueError:
+        pass
+    
+    # Extra text around the object - parse from the first '{', ignoring whatever follows
+    start = text.find('{')
+    if start >= 0:
+        try:
+            return _JSON_DECODER.raw_decode(text, start)[0]
+        except ValueError:
+            pass
+    
+    # Slice from the first '{' to the last '}' for the lenient parser
+    end = text.rfind('}') + 1
+    if start >= 0 and end > start:
+        text = text[start:end]
+    
+    if json5 is not None:
+        try:
+            return json5.loads(text)
+        except ValueError:
+            pass
+    
+    raise ValueError(f"No valid JSON object found in response: {content[:200]}")
+
+
+def stream_json_content(llm, messages: List[BaseMessage]) -> str:
+    """
+    Stream an LLM response and stop as soon as the first JSON object is complete.
+
+    Args:
+        llm: LLM client supporting ``stream``
+        messages: Messages to send
+
+    Returns:
+        Response text up to and including the closing brace of the first JSON object
+        (or the full response if no complete object was seen)
+    """
+    parts = []
+    depth = 0
+    in_string = False
+    escaped = False
+    stream = llm.stream(messages)
+    try:
+        for chunk in stream:
+            text = chunk.content if hasattr(chunk, 'content') else str(chunk)
+            if not isinstance(text, str):
+                text = str(text)
+            for i, char in enumerate(text):
+                if in_string:
+                    if escaped:
+                        escaped = False
+                    elif char == '\\':
+                        escaped = True
+                    elif char == '"':
+                        in_string = False
+                elif depth and char == '"':
+                    in_string = True
+                elif char == '{':
+                    depth += 1
+                elif char == '}' and depth:
+                    depth -= 1
+                    if depth == 0:
+                        parts.append(text[:i + 1])
+                        return ''.join(parts)
+            parts.append(text)
+    finally:
+        close = getattr(stream, 'close', None)
+        if close:
+            close()
+    return ''.join(parts)
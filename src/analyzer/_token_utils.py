@@ -0,0 +1,46 @@
+"""Token-based truncation for LLM prompts."""
+
+import functools
+
+# Approximate characters per token, used when tiktoken is not installed
+_CHARS_PER_TOKEN = 4
+
+
+@functools.lru_cache(maxsize=1)
+def _get_encoding():
+    """Load the tokenizer once (None if tiktoken is unavailable)."""
+    try:
+        import tiktoken
+        return tiktoken.get_encoding("cl100k_base")
+    except Exception:
+        return None
+
+
+def cap_tokens(text: str, max_tokens: int) -> str:
+    """
+    Truncate text to at most max_tokens tokens.
+
+    Falls back to an approximate character limit when tiktoken is not installed.
+
+    Args:
+        text: Text to truncate
+        max_tokens: Token budget
+
+    Returns:
+        The text, truncated if it exceeds the budget
+    """
+    # Byte-level BPE tokens each cover at least one UTF-8 byte (but not necessarily a
+    # whole character), so text no longer in bytes than the budget never needs encoding.
+    # The byte count is never below the character count, so long text skips the copy.
+    if len(text) <= max_tokens and len(text.encode('utf-8', 'surrogatepass')) <= max_tokens:
+        return text
+
+    encoding = _get_encoding()
+    if encoding is None:
+        limit = max_tokens * _CHARS_PER_TOKEN
+        return text if len(text) <= limit else text[:limit]
+
+    tokens = encoding.encode(text, disallowed_special=())
+    if len(tokens) <= max_tokens:
+        return text
+    return encoding.decode(tokens[:max_tokens])
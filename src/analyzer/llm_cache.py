@@ -0,0 +1,133 @@
+"""Persistent response cache for LLM calls."""
+
+import functools
+import hashlib
+import os
+import sqlite3
+import threading
+import time
+from typing import List, Optional
+from langchain_core.messages import AIMessage, AIMessageChunk, BaseMessage
+from .llm_client import get_llm_client
+
+# Set LLM_CACHE_PATH to an empty string to disable the cache
+_CACHE_PATH = os.getenv("LLM_CACHE_PATH", "/tmp/llm_cache.sqlite3")
+# Cached responses expire after LLM_CACHE_TTL seconds; only the newest LLM_CACHE_MAX_ROWS are kept
+_CACHE_TTL = int(os.getenv("LLM_CACHE_TTL", str(7 * 24 * 3600)))
+_CACHE_MAX_ROWS = int(os.getenv("LLM_CACHE_MAX_ROWS", "10000"))
+
+
+def _cache_key(llm, messages: List[BaseMessage]) -> str:
+    """Hash the model name and messages into a cache key."""
+    model = getattr(llm, 'model_name', None) or getattr(llm, 'model', None) or type(llm).__name__
+    digest = hashlib.blake2b(str(model).encode(), digest_size=32)
+    for message in messages:
+        digest.update(b"\x1e")
+        digest.update(message.type.encode())
+        digest.update(b"\x00")
+        digest.update(str(message.content).encode())
+    return digest.hexdigest()
+
+
+class CachedLLM:
+    """
+    Proxy around an LLM client that reuses responses for identical prompts.
+    
+    Responses are only cached through store(), once the caller has parsed and validated
+    them, so a malformed or truncated reply is never replayed.
+    """
+
+    def __init__(self, llm, path: str = _CACHE_PATH, ttl: int = _CACHE_TTL, max_rows: int = _CACHE_MAX_ROWS):
+        self._llm = llm
+        self._ttl = ttl
+        self._max_rows = max_rows
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(path, check_same_thread=False)
+        with self._lock:
+            # The old unversioned table stored unvalidated responses with no expiry
+            self._conn.execute("DROP TABLE IF EXISTS responses")
+            self._conn.execute(
+                "CREATE TABLE IF NOT EXISTS llm_responses "
+                "(key TEXT PRIMARY KEY, content TEXT NOT NULL, created REAL NOT NULL)"
+            )
+            self._conn.execute("CREATE INDEX IF NOT EXISTS llm_responses_created ON llm_responses (created)")
+            self._conn.commit()
+
+    def _get(self, key: str) -> Optional[str]:
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT content FROM llm_responses WHERE key = ? AND created > ?",
+                (key, time.time() - self._ttl)
+            ).fetchone()
+        return row[0] if row else None
+
+    def _set(self, key: str, content: str) -> None:
+        now = time.time()
+        with self._lock:
+            self._conn.execute(
+                "INSERT OR REPLACE INTO llm_responses (key, content, created) VALUES (?, ?, ?)",
+                (key, content, now)
+            )
+            # Drop expired rows and everything beyond the newest max_rows
+            self._conn.execute(
+                "DELETE FROM llm_responses WHERE created <= ? OR key NOT IN "
+                "(SELECT key FROM llm_responses ORDER BY created DESC LIMIT ?)",
+                (now - self._ttl, self._max_rows)
+            )
+            self._conn.commit()
+
+    def invoke(self, messages: List[BaseMessage], **kwargs):
+        """Return the cached response for these messages, calling the LLM on a miss."""
+        try:
+            cached = self._get(_cache_key(self._llm, messages))
+        except sqlite3.Error:
+            cached = None
+        if cached is not None:
+            return AIMessage(content=cached)
+        return self._llm.invoke(messages, **kwargs)
+
+    def stream(self, messages: List[BaseMessage], **kwargs):
+        """Stream the response for these messages, replaying the cached text on a hit."""
+        try:
+            cached = self._get(_cache_key(self._llm, messages))
+        except sqlite3.Error:
+            cached = None
+        if cached is not None:
+            yield AIMessageChunk(content=cached)
+            return
+        yield from self._llm.stream(messages, **kwargs)
+
+    def store(self, messages: List[BaseMessage], content: str) -> None:
+        """Cache a response to these messages that the caller has parsed and validated."""
+        try:
+            self._set(_cache_key(self._llm, messages), content)
+        except sqlite3.Error:
+            pass
+
+    def __getattr__(self, name):
+        return getattr(self._llm, name)
+
+
+@functools.lru_cache(maxsize=1)
+def get_shared_llm_client():
+    """Get the process-wide LLM client, so its HTTP connection pool is reused across calls."""
+    return get_llm_client()
+
+
+@functools.lru_cache(maxsize=1)
+def get_cached_llm_client():
+    """Get the LLM client wrapped with the response cache (or the bare client if disabled)."""
+    llm = get_shared_llm_client()
+    if not _CACHE_PATH:
+        return llm
+    try:
+        return CachedLLM(llm)
+    except sqlite3.Error:
+        # Cache location not writable - fall back to uncached calls
+        return llm
+
+
+def store_response(llm, messages: List[BaseMessage], content: str) -> None:
+    """Cache a validated response if llm is a CachedLLM (no-op for the bare client)."""
+    if isinstance(llm, CachedLLM):
+        llm.store(messages, content)
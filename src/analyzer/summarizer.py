@@ -1,11 +1,14 @@
 """LLM summarization for website content."""
 
-from typing import Dict
+from typing import Dict, Tuple
 from langchain_core.messages import HumanMessage, SystemMessage
 from pydantic import BaseModel, Field
 from typing import List
-import json
-from .llm_client import get_llm_client
+from ..scraper.content_extractor import Content
+from .llm_cache import get_cached_llm_client, store_response
+from ._json_utils import parse_llm_json, stream_json_content
+from ._token_utils import cap_tokens
+from .naics_classifier import NAICSClassification
 
 
 class BusinessSummary(BaseModel):
@@ -15,93 +18,78 @@ class BusinessSummary(BaseModel):
     countries_dealing_with: List[str] = Field(description="Countries the company does business with")
 
 
-def summarize_website_structured(content: Dict[str, str], job_id: str = None) -> Dict:
-    """Generate a structured summary of a business website."""
-    from ..api.jobs import job_manager
-    
-    if job_id:
-        job_manager.add_log(job_id, "Generating business summary with LLM...")
-    
-    # Combine all content
-    full_text = f"""
-Homepage: {content.get('homepage', '')[:10000]}
-About: {content.get('about', '')[:5000]}
-Products: {content.get('products', '')[:5000]}
-Contact: {content.get('contact', '')[:2000]}
-"""
-    
-    # Build prompt text using f-string - no template variables to avoid parsing issues
-    prompt_text = f"""Analyze this business website and extract:
+# Prompt is kept byte-identical across calls so provider-side prompt caching can reuse it
+_SUMMARY_AND_NAICS_SYSTEM = SystemMessage(content="""You are a business analyst and classification expert. Analyze the website content, extract structured information and assign NAICS codes.
+
+Extract:
 1. Nature of the business
 2. Products and services offered
 3. Countries where the company operates
 4. Countries the company deals with
+5. Appropriate NAICS codes (6-digit format) for the business
 
 You must return ONLY a valid JSON object with this exact structure:
-{{"nature": "description", "products_services": "description", "countries_operating": ["country1"], "countries_dealing_with": ["country1"]}}
+{"summary": {"nature": "description", "products_services": "description", "countries_operating": ["country1"], "countries_dealing_with": ["country1"]}, "naics": {"codes": ["code1", "code2"], "primary_code": "main_code", "explanation": "brief explanation"}}
+
+Rules:
+- Keep all descriptions concise and focused.
+- Use full country names (e.g. "United Kingdom", not "UK").
+- Use an empty list when no countries can be identified.
+- NAICS codes must be 6-digit strings; primary_code must be one of the codes.
+- Keep the NAICS explanation to 2-3 sentences maximum.
+- Base the answer only on the website content provided.
+
+Example response:
+{"summary": {"nature": "Manufacturer of industrial hydraulic pumps", "products_services": "Hydraulic pumps, spare parts and maintenance services", "countries_operating": ["United Kingdom", "Germany"], "countries_dealing_with": ["United Kingdom", "Germany", "France", "United States"]}, "naics": {"codes": ["333996", "811310"], "primary_code": "333996", "explanation": "The company manufactures fluid power pumps. It also repairs and maintains industrial machinery."}}
+
+Return ONLY the JSON object, no markdown, no code blocks, no other text.""")
 
-Keep all descriptions concise and focused.
 
-Website content:
-{full_text}
+def _build_website_content(content: Content) -> str:
+    """Combine all content into the per-call prompt payload, capped by token budget."""
+    return "".join((
+        "Website content:\n\nHomepage: ", cap_tokens(content.homepage, 2500),
+        "\nAbout: ", cap_tokens(content.about, 1250),
+        "\nProducts: ", cap_tokens(content.products, 1250),
+        "\nContact: ", cap_tokens(content.contact, 500),
+        "\n",
+    ))
 
-Return ONLY the JSON object, no markdown, no code blocks, no other text."""
+
+def summarize_and_classify(content: Content, job_id: str = None) -> Tuple[Dict, Dict]:
+    """Generate the business summary and NAICS classification in a single LLM call."""
+    from ..api.jobs import job_manager
     
-    # Construct messages directly - bypasses template parsing entirely
+    if job_id:
+        job_manager.add_log(job_id, "Generating business summary and NAICS codes with LLM...")
+    
+    # Static instructions live in the system message; only the website content varies per call
     messages = [
-        SystemMessage(content="You are a business analyst. Analyze the website content and extract structured information. You must respond with ONLY valid JSON, no other text."),
-        HumanMessage(content=prompt_text)
+        _SUMMARY_AND_NAICS_SYSTEM,
+        HumanMessage(content=_build_website_content(content))
     ]
     
-    llm = get_llm_client()
+    llm = get_cached_llm_client()
     # Don't use with_structured_output - Perplexity doesn't support it. Just call LLM directly.
-    response = llm.invoke(messages)
-    
-    # Extract JSON from response content
-    content_str = response.content if hasattr(response, 'content') else str(response)
+    # Stream the response and stop reading as soon as the JSON object is complete
+    content_str = stream_json_content(llm, messages)
     
-    # Clean up the response to extract JSON
-    json_str = content_str.strip()
-    
-    # Remove markdown code blocks if present
-    if json_str.startswith("```json"):
-        json_str = json_str[7:]
-    elif json_str.startswith("```"):
-        json_str = json_str[3:]
-    if json_str.endswith("```"):
-        json_str = json_str[:-3]
-    json_str = json_str.strip()
-    
-    # Try to find JSON object in the string if there's extra text
-    if not json_str.startswith("{"):
-        # Find first {
-        start_idx = json_str.find("{")
-        if start_idx >= 0:
-            json_str = json_str[start_idx:]
-            # Find matching closing brace
-            brace_count = 0
-            end_idx = -1
-            for i, char in enumerate(json_str):
-                if char == "{":
-                    brace_count += 1
-                elif char == "}":
-                    brace_count -= 1
-                    if brace_count == 0:
-                        end_idx = i + 1
-                        break
-            if end_idx > 0:
-                json_str = json_str[:end_idx]
-    
-    # Parse JSON and validate with Pydantic
+    # Parse JSON once, then split and validate each half (field types included, since
+    # a response that passes is cached and replayed to the API models on later runs)
     try:
-        data = json.loads(json_str)
-        result = BusinessSummary(**data).model_dump()
+        data = parse_llm_json(content_str)
+        summary = BusinessSummary.model_validate(data['summary']).model_dump()
+        naics = NAICSClassification.model_validate(data['naics']).model_dump()
     except Exception as e:
         if job_id:
-            job_manager.add_log(job_id, f"Failed to parse summary response: {e}, content: {content_str[:200]}")
-        raise ValueError(f"Failed to parse business summary: {e}. Response: {content_str[:200]}")
+            job_manager.add_log(job_id, f"Failed to parse summary/NAICS response: {e}, content: {content_str[:200]}")
+        raise ValueError(f"Failed to parse business summary and NAICS classification: {e}. Response: {content_str[:200]}")
+    
+    # Only a response that parsed and validated is worth replaying
+    store_response(llm, messages, content_str)
     
     if job_id:
-        job_manager.add_log(job_id, f"Summary generated: {result.get('nature', '')[:100]}...")
+        job_manager.add_log(job_id, f"Summary generated: {summary.get('nature', '')[:100]}...")
+        job_manager.add_log(job_id, f"NAICS classified: {naics.get('primary_code', 'N/A')}")
     
-    return result
+    return summary, naics
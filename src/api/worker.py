@@ -1,17 +1,44 @@
 """Background worker for processing analysis jobs."""
 
+import os
 import time
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime
+from typing import List, Tuple
 from .jobs import job_manager, JobStatus
 from .models import AnalysisResult, BusinessSummary, NAICSResponse, FlagsResponse, FlagResult, AddressResponse, AddressValidation, CompanyRegistration
 
-from src.scraper.content_extractor import extract_all_content
-from src.analyzer.summarizer import summarize_website_structured
-from src.analyzer.naics_classifier import classify_naics_structured
+from src.scraper.content_extractor import Content, extract_all_content
+from src.analyzer.summarizer import summarize_and_classify
 from src.flags.flag_runner import run_all_checks
 from src.utils.address_extractor import extract_address
 from src.utils.company_registration import extract_company_registration
 
+# Maximum number of jobs process_analysis_jobs runs at once
+_MAX_CONCURRENT_JOBS = int(os.getenv("ANALYSIS_MAX_CONCURRENCY", "10"))
+
+
+def _extract_and_validate_address(content: Content, nature: str, job_id: str) -> AddressResponse:
+    """Extract the business address and validate it."""
+    address_text = extract_address(content, job_id=job_id)
+    if not address_text:
+        return AddressResponse(
+            address=None,
+            validation=AddressValidation(valid=False, notes="No address found"),
+            makes_sense=None
+        )
+    
+    # Actually validate the address
+    from src.utils.address_validator import validate_address, check_address_makes_sense
+    address_validation_dict = validate_address(address_text)
+    address_sense = check_address_makes_sense(address_text, nature)
+    
+    return AddressResponse(
+        address=address_text,
+        validation=AddressValidation(**address_validation_dict),
+        makes_sense=address_sense
+    )
+
 
 def process_analysis_job(job_id: str, url: str) -> None:
     """Process an analysis job."""
@@ -27,6 +54,7 @@ def process_analysis_job(job_id: str, url: str) -> None:
         
         # Step 1: Scrape website
         content = extract_all_content(url, use_playwright=False, job_id=job_id)
+        sections = Content.from_dict(content)
         job_manager.update_job_status(
             job_id,
             JobStatus.PROCESSING,
@@ -34,70 +62,37 @@ def process_analysis_job(job_id: str, url: str) -> None:
             message="Website scraped, analyzing content..."
         )
         
-        # Step 2: Generate summary
-        summary_dict = summarize_website_structured(content, job_id=job_id)
+        # Step 2: Generate summary and classify NAICS (single LLM call)
+        summary_dict, naics_dict = summarize_and_classify(sections, job_id=job_id)
         summary = BusinessSummary(**summary_dict)
+        naics = NAICSResponse(**naics_dict)
+
+        # Steps 3-5 only depend on the scraped content, so run them concurrently
         job_manager.update_job_status(
             job_id,
             JobStatus.PROCESSING,
-            progress=40,
-            message="Summary generated, checking flags..."
+            progress=70,
+            message="Summary generated and NAICS classified, checking flags, company registration and address..."
         )
+        with ThreadPoolExecutor(max_workers=3) as executor:
+            # Step 3: Run flag checks
+            flags_future = executor.submit(run_all_checks, content, job_id=job_id)
+            # Step 4: Extract company registration
+            company_future = executor.submit(extract_company_registration, sections, job_id=job_id, url=url)
+            # Step 5: Extract and validate address
+            address_future = executor.submit(_extract_and_validate_address, sections, summary.nature, job_id)
+            
+            flags_dict = flags_future.result()
+            company_registration = company_future.result()
+            address = address_future.result()
         
-        # Step 3: Run flag checks
-        flags_dict = run_all_checks(content, job_id=job_id)
         flags = FlagsResponse(
             sanctions=FlagResult(**flags_dict['sanctions']),
             military=FlagResult(**flags_dict['military']),
             dual_use=FlagResult(**flags_dict['dual_use']),
             any_flags=flags_dict['any_flags']
         )
-        job_manager.update_job_status(
-            job_id,
-            JobStatus.PROCESSING,
-            progress=60,
-            message="Flags checked, classifying NAICS..."
-        )
-        
-        # Step 4: Classify NAICS
-        naics_dict = classify_naics_structured(summary_dict, job_id=job_id)
-        naics = NAICSResponse(**naics_dict)
-        job_manager.update_job_status(
-            job_id,
-            JobStatus.PROCESSING,
-            progress=70,
-            message="NAICS classified, extracting details..."
-        )
-        
-        # Step 5: Extract company registration
-        company_registration = extract_company_registration(content, job_id=job_id)
         company_reg_obj = CompanyRegistration(**company_registration) if any(company_registration.values()) else None
-        job_manager.update_job_status(
-            job_id,
-            JobStatus.PROCESSING,
-            progress=80,
-            message="Company registration extracted, extracting address..."
-        )
-        
-        # Step 6: Extract address
-        address_text = extract_address(content, job_id=job_id)
-        if address_text:
-            # Actually validate the address
-            from src.utils.address_validator import validate_address, check_address_makes_sense
-            address_validation_dict = validate_address(address_text)
-            address_sense = check_address_makes_sense(address_text, summary.nature)
-            
-            address = AddressResponse(
-                address=address_text,
-                validation=AddressValidation(**address_validation_dict),
-                makes_sense=address_sense
-            )
-        else:
-            address = AddressResponse(
-                address=None,
-                validation=AddressValidation(valid=False, notes="No address found"),
-                makes_sense=None
-            )
         
         job_manager.update_job_status(
             job_id,
@@ -106,7 +101,7 @@ def process_analysis_job(job_id: str, url: str) -> None:
             message="Finalizing results..."
         )
         
-        # Step 7: Create result
+        # Step 6: Create result
         result = AnalysisResult(
             url=url,
             timestamp=datetime.now().isoformat(),
@@ -138,3 +133,22 @@ def process_analysis_job(job_id: str, url: str) -> None:
             message=f"Analysis failed: {error_msg}",
             error=error_msg
         )
+
+
+def process_analysis_jobs(jobs: List[Tuple[str, str]]) -> None:
+    """
+    Process several analysis jobs concurrently.
+    
+    Jobs spend most of their time waiting on LLM and HTTP calls, so running them
+    side by side (bounded by ANALYSIS_MAX_CONCURRENCY) overlaps those waits.
+    
+    Args:
+        jobs: List of (job_id, url) pairs
+    """
+    if not jobs:
+        return
+    
+    job_ids, urls = zip(*jobs)
+    with ThreadPoolExecutor(max_workers=min(_MAX_CONCURRENT_JOBS, len(jobs))) as executor:
+        # Each job records its own failure, so there are no results to collect
+        list(executor.map(process_analysis_job, job_ids, urls))
@@ -1,9 +1,65 @@
 """Extract structured content from website pages."""
 
-from bs4 import BeautifulSoup
-from typing import Dict, Optional
+import lxml.html
+import re
+from concurrent.futures import ThreadPoolExecutor
+from lxml import etree
+from typing import Dict, List, NamedTuple, Optional
 from urllib.parse import urljoin
 from .basic_scraper import fetch_url
+from ..utils._cache_utils import LRUCache
+
+# Keywords identifying links to the about, contact and products/services pages
+_LINK_KEYWORDS = (
+    ('about', ('about',)),
+    ('contact', ('contact',)),
+    ('products', ('product', 'service', 'offer')),
+)
+# One case-insensitive alternation per page type, so each string is scanned once per type
+_LINK_PATTERNS = tuple(
+    (kind, re.compile('|'.join(map(re.escape, keywords)), re.IGNORECASE))
+    for kind, keywords in _LINK_KEYWORDS
+)
+
+# Text of recently fetched linked pages (url -> (expiry, text)), so re-analyses skip the refetch
+_PAGE_CACHE_TTL = 3600
+_PAGE_CACHE_MAXSIZE = 1024
+_page_cache = LRUCache(_PAGE_CACHE_MAXSIZE, ttl=_PAGE_CACHE_TTL)
+
+# Elements whose text is never page content, selected in a single precompiled XPath query
+_UNWANTED_ELEMENTS = etree.XPath("//script | //style | //nav | //footer | //header")
+
+
+class Content(NamedTuple):
+    """Extracted text of the website's main pages, plus the homepage <title>."""
+    homepage: str = ""
+    about: str = ""
+    contact: str = ""
+    products: str = ""
+    title: str = ""
+    
+    @classmethod
+    def from_dict(cls, content: Dict[str, str]) -> "Content":
+        """Build from the dictionary returned by extract_all_content."""
+        return cls(*(content.get(field) or "" for field in cls._fields))
+
+
+def _parse_html(html: str):
+    """Parse an HTML string into an lxml tree."""
+    # Parse from UTF-8 bytes so pages with an XML encoding declaration are accepted
+    parser = lxml.html.HTMLParser(encoding='utf-8')
+    try:
+        return lxml.html.document_fromstring(html.encode('utf-8', errors='replace'), parser=parser)
+    except etree.ParserError:
+        # Empty document
+        return lxml.html.document_fromstring(b"<html></html>", parser=parser)
+
+
+def _extract_text(tree) -> str:
+    """Remove script, style and navigation elements and return the remaining text."""
+    for element in _UNWANTED_ELEMENTS(tree):
+        element.drop_tree()
+    return ' '.join(text for text in (s.strip() for s in tree.itertext()) if text)
 
 
 def extract_content_from_html(html: str, base_url: str) -> Dict[str, str]:
@@ -17,79 +73,64 @@ def extract_content_from_html(html: str, base_url: str) -> Dict[str, str]:
     Returns:
         Dictionary with extracted content
     """
-    soup = BeautifulSoup(html, 'lxml')
-    
-    # Remove script and style elements
-    for script in soup(["script", "style", "nav", "footer", "header"]):
-        script.decompose()
-    
-    homepage_text = soup.get_text(separator=' ', strip=True)
+    tree = _parse_html(html)
+    title = ' '.join((tree.findtext('.//title') or '').split())
+    homepage_text = _extract_text(tree)
     
     # Try to find and extract other pages (limit to avoid hanging)
-    about_content = ""
-    contact_content = ""
-    products_content = ""
-    
-    links = soup.find_all('a', href=True)[:20]
-    
-    # About page
-    try:
-        for link in links:
-            href = link.get('href', '').lower()
-            link_text = link.get_text().lower()
-            if 'about' in href or 'about' in link_text:
-                about_url = urljoin(base_url, link.get('href'))
-                about_content = _fetch_page_content(about_url)
-                if about_content:
-                    break
-    except Exception:
-        pass
-    
-    # Contact page
+    # Collect candidate links for every page type in a single pass
+    candidates = {kind: [] for kind, _ in _LINK_KEYWORDS}
     try:
-        for link in links:
-            href = link.get('href', '').lower()
-            link_text = link.get_text().lower()
-            if 'contact' in href or 'contact' in link_text:
-                contact_url = urljoin(base_url, link.get('href'))
-                contact_content = _fetch_page_content(contact_url)
-                if contact_content:
-                    break
+        for link in tree.xpath('//a[@href]')[:20]:
+            href = link.get('href')
+            link_text = link.text_content()
+            for kind, pattern in _LINK_PATTERNS:
+                if pattern.search(href) or pattern.search(link_text):
+                    candidates[kind].append(urljoin(base_url, href))
     except Exception:
         pass
     
-    # Products/Services page
-    try:
-        for link in links:
-            href = link.get('href', '').lower()
-            link_text = link.get_text().lower()
-            if any(keyword in href or keyword in link_text for keyword in ['product', 'service', 'offer']):
-                products_url = urljoin(base_url, link.get('href'))
-                products_content = _fetch_page_content(products_url)
-                if products_content:
-                    break
-    except Exception:
-        pass
+    # Fetch about/contact/products pages concurrently
+    with ThreadPoolExecutor(max_workers=len(candidates)) as executor:
+        pages = dict(zip(candidates, executor.map(_fetch_first_page, candidates.values())))
+    about_content = pages['about']
+    contact_content = pages['contact']
+    products_content = pages['products']
     
     return {
         'homepage': homepage_text[:50000],
         'about': about_content[:50000] if about_content else "",
         'contact': contact_content[:50000] if contact_content else "",
-        'products': products_content[:50000] if products_content else ""
+        'products': products_content[:50000] if products_content else "",
+        'title': title[:500]
     }
 
 
 def _fetch_page_content(url: str) -> Optional[str]:
     """Helper to fetch content from a linked page."""
+    cached = _page_cache.get(url)
+    if cached is not None:
+        return cached
+    
     try:
         from .basic_scraper import fetch_url
         html = fetch_url(url)
-        soup = BeautifulSoup(html, 'lxml')
-        for script in soup(["script", "style", "nav", "footer", "header"]):
-            script.decompose()
-        return soup.get_text(separator=' ', strip=True)
+        text = _extract_text(_parse_html(html))
     except Exception:
         return None
+    
+    if text:
+        _page_cache.set(url, text)
+    return text
+
+
+def _fetch_first_page(urls: List[str]) -> str:
+    """Fetch the first candidate URL that returns content."""
+    for url in urls:
+        content = _fetch_page_content(url)
+        if content:
+            return content
+    return ""
 
 
 def extract_all_content(url: str, use_playwright: bool = False, job_id: str = None) -> Dict[str, str]:
@@ -0,0 +1,51 @@
+"""Small in-process caches shared by the scraper and the extractors."""
+
+import math
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Dict, Hashable, Optional
+
+
+class LRUCache:
+    """Thread-safe least-recently-used cache with optional expiry and hit/miss counts."""
+
+    def __init__(self, maxsize: int, ttl: float = math.inf):
+        """
+        Args:
+            maxsize: Maximum number of entries; the least recently used are evicted beyond it
+            ttl: Seconds an entry stays valid (never expires by default)
+        """
+        self.maxsize = maxsize
+        self.ttl = ttl
+        self._entries: "OrderedDict[Hashable, tuple]" = OrderedDict()  # key -> (expiry, value)
+        self._lock = threading.Lock()
+        self._hits = 0
+        self._misses = 0
+
+    def get(self, key: Hashable) -> Optional[Any]:
+        """Return the value for key, or None if it is missing or expired."""
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None and entry[0] <= time.monotonic():
+                del self._entries[key]
+                entry = None
+            if entry is None:
+                self._misses += 1
+                return None
+            self._hits += 1
+            self._entries.move_to_end(key)
+            return entry[1]
+
+    def set(self, key: Hashable, value: Any) -> None:
+        """Store a value, evicting the least recently used entries beyond maxsize."""
+        with self._lock:
+            self._entries[key] = (time.monotonic() + self.ttl, value)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.maxsize:
+                self._entries.popitem(last=False)
+
+    def info(self) -> Dict[str, int]:
+        """Return 'hits', 'misses', 'maxsize' and 'currsize', like functools' cache_info."""
+        with self._lock:
+            return {'hits': self._hits, 'misses': self._misses, 'maxsize': self.maxsize, 'currsize': len(self._entries)}
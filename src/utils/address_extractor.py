@@ -1,97 +1,185 @@
 """Extract business address from website content."""
 
-from typing import Optional, Dict
+from typing import Optional
 import re
 from langchain_core.messages import HumanMessage, SystemMessage
-from ..analyzer.llm_client import get_llm_client
+from ..analyzer.llm_cache import get_shared_llm_client
+from ..scraper.content_extractor import Content
+
+try:
+    from postal.parser import parse_address
+except ImportError:
+    parse_address = None
+
+# RE2 (linear-time matching) for the address sanity check when installed, else stdlib re.
+# Patterns below use inline flags and plain escapes so they compile under either engine.
+try:
+    import re2 as _sanity_re
+except ImportError:
+    _sanity_re = re
+
+# Common e-commerce UI terms, matched case-insensitively in a single pass
+_ECOMMERCE_TERMS = ['add to basket', 'add to cart', 'best sellers', 'add to wishlist',
+                    'buy now', 'checkout', 'shopping cart', 'price', '£', '$', '€',
+                    'add to bag', 'shop now', 'view cart']
+_ECOMMERCE_RE = _sanity_re.compile(
+    '(?i)' + '|'.join(re.escape(term).replace('\\ ', ' ') for term in _ECOMMERCE_TERMS)
+)
+
+_POSTAL_RE = re.compile(r'\b[A-Z]{1,2}\d{1,2}\s?\d[A-Z]{2}\b|\b\d{5}(-\d{4})?\b', re.IGNORECASE)
+
+# Street indicators and postal codes, found in a single pass
+_ADDRESS_SIGNALS_RE = _sanity_re.compile(
+    r'(?i)\b(?:Street|St|Road|Rd|Avenue|Ave|Lane|Ln|Drive|Dr|Way|Boulevard|Blvd|Close|Cl|Crescent|Cres|Place|Pl|Square|Sq)\b'
+    r'|\b[A-Z]{1,2}\d{1,2}\s?\d[A-Z]{2}\b|\b\d{5}(?:-\d{4})?\b'
+)
+
+_DIGITS = frozenset('0123456789')
+
+# Street words accepted in LLM output that fails the stricter check (substring match, like `in`)
+_LENIENT_STREET_RE = re.compile('street|road|avenue|lane|drive|way|st|rd|ave', re.IGNORECASE)
+
+# Building blocks for the address patterns. Every run is bounded and the locality
+# parts are split on commas, so a failed match backtracks over at most a few dozen
+# characters instead of going polynomial on long text without the expected delimiters.
+_STREET_SUFFIX = r'(?:Street|St|Road|Rd|Avenue|Ave|Lane|Ln|Drive|Dr|Way|Boulevard|Blvd)'
+_UK_STREET_SUFFIX = r'(?:Street|St|Road|Rd|Avenue|Ave|Lane|Ln|Drive|Dr|Way|Boulevard|Blvd|Close|Cl|Crescent|Cres|Place|Pl)'
+_ADDR_HEAD = r'\d+[,\s]{1,5}[A-Za-z\s]{1,40}'
+_ADDR_LOCALITY = r'[,\s]{1,5}[A-Za-z\s]{1,60}(?:,\s*[A-Za-z\s]{1,60})?'
+
+# Regex patterns for common address formats (US, UK, international)
+_ADDR_PATTERNS = [re.compile(pattern, re.IGNORECASE) for pattern in (
+    # US format: 123 Main St, City, ST 12345
+    _ADDR_HEAD + _STREET_SUFFIX + _ADDR_LOCALITY + r'(?:,\s*)?[A-Z]{2}\s*\d{5,10}',
+    # UK format: 123 High Street, City, Postcode
+    _ADDR_HEAD + _UK_STREET_SUFFIX + _ADDR_LOCALITY + r'(?:,\s*)?[A-Z]{1,2}\d{1,2}\s?\d[A-Z]{2}',
+    # Generic: Number + Street + City + Postal
+    _ADDR_HEAD + _STREET_SUFFIX + _ADDR_LOCALITY + r'(?:,\s*)?[A-Z]{1,2}?\d{1,2}\s?\d[A-Z]{2}',
+    # Generic: Number + Street + City
+    _ADDR_HEAD + _STREET_SUFFIX + _ADDR_LOCALITY,
+)]
+
+# Kept as a single module-level message so the prompt prefix is identical on every call
+_ADDR_SYSTEM = SystemMessage(content="""You are an address extraction assistant. Extract ONLY the complete business address from the text.
+            A valid address must include:
+            - Street number and name (e.g., "123 Main Street")
+            - City name
+            - State/Province or postal code
+            - Country (optional but preferred)
+            
+            Do NOT extract:
+            - Product names, prices, or e-commerce UI text
+            - Phone numbers or email addresses alone
+            - Partial addresses or just city names
+            - Text like "Add to Basket", "Best Sellers", "Add to wishlist", etc.
+            - Shopping cart or checkout related text
+            
+            The user message contains the website text to analyze.
+            Return ONLY the address, or 'None' if no valid address is found.""")
 
 
 def _looks_like_address(text: str) -> bool:
     """Check if text looks like a valid address."""
+    # Cheapest checks first. Four words need at least seven characters, and the
+    # split stops after the fourth word so long text isn't split in full.
+    if len(text) < 7 or len(text.split(maxsplit=3)) < 4:
+        return False
+    
+    # Must contain a number - a plain character-set test, no regex needed
+    if _DIGITS.isdisjoint(text):
+        return False
+    
     # Must not contain common e-commerce UI terms
-    ecommerce_terms = ['add to basket', 'add to cart', 'best sellers', 'add to wishlist', 
-                       'buy now', 'checkout', 'shopping cart', 'price', '£', '$', '€',
-                       'add to bag', 'shop now', 'view cart']
-    text_lower = text.lower()
-    if any(term in text_lower for term in ecommerce_terms):
+    if _ECOMMERCE_RE.search(text):
         return False
     
-    # Must contain street indicators or postal code patterns
-    has_street = bool(re.search(r'\b(Street|St|Road|Rd|Avenue|Ave|Lane|Ln|Drive|Dr|Way|Boulevard|Blvd|Close|Cl|Crescent|Cres|Place|Pl|Square|Sq)\b', text, re.IGNORECASE))
-    has_postal = bool(re.search(r'\b[A-Z]{1,2}\d{1,2}\s?\d[A-Z]{2}\b|\b\d{5}(-\d{4})?\b', text, re.IGNORECASE))
-    has_number = bool(re.search(r'\b\d+\b', text))
+    # Must have a street indicator OR postal code
+    return _ADDRESS_SIGNALS_RE.search(text) is not None
+
+
+def _extract_with_libpostal(text: str, max_candidates: int = 50) -> Optional[str]:
+    """
+    Find an address ending at a postal code using libpostal's address parser.
+    
+    Args:
+        text: Website text to search
+        max_candidates: Maximum number of postal code matches to try
+        
+    Returns:
+        Address string, or None if libpostal is not installed or nothing was found
+    """
+    if parse_address is None:
+        return None
     
-    # Must have at least street indicator OR postal code, AND a number, AND minimum word count
-    return (has_street or has_postal) and has_number and len(text.split()) >= 4
+    for i, match in enumerate(_POSTAL_RE.finditer(text)):
+        if i >= max_candidates:
+            break
+        window = text[max(0, match.start() - 120):match.end()]
+        components = parse_address(window)
+        labels = {label for _, label in components}
+        if not {'road', 'postcode'} <= labels or not labels & {'city', 'suburb', 'city_district', 'state'}:
+            continue
+        
+        # Start the address at the first house number or road component
+        first = next((value for value, label in components if label in ('house_number', 'road')), None)
+        start = window.lower().find(first) if first else -1
+        if start < 0:
+            continue
+        candidate = window[start:].strip()
+        if _looks_like_address(candidate):
+            return candidate
+    
+    return None
 
 
-def extract_address(content: Dict[str, str], job_id: str = None) -> Optional[str]:
+def extract_address(content: Content, job_id: str = None) -> Optional[str]:
     """Extract business address from website content."""
     from ..api.jobs import job_manager
     
     if job_id:
         job_manager.add_log(job_id, "Extracting address from website content...")
     
-    # Combine contact and about pages (prioritize contact page)
-    text = f"{content.get('contact', '')} {content.get('about', '')} {content.get('homepage', '')}"
+    # Prioritize contact page, then about page, then homepage
+    sections = (content.contact, content.about, content.homepage)
     
     # Debug: Log if we have content
-    if job_id and not text.strip():
+    if job_id and not any(section.strip() for section in sections):
         job_manager.add_log(job_id, "Warning: No content available for address extraction")
     elif job_id:
-        job_manager.add_log(job_id, f"Analyzing {len(text)} characters of content for address extraction")
+        job_manager.add_log(job_id, f"Analyzing {sum(map(len, sections)) + 2} characters of content for address extraction")
     
-    # Try regex patterns for common address formats (US, UK, international)
-    address_patterns = [
-        # US format: 123 Main St, City, ST 12345
-        r'\d+[,\s]+[A-Za-z\s]+(?:Street|St|Road|Rd|Avenue|Ave|Lane|Ln|Drive|Dr|Way|Boulevard|Blvd)[,\s]+[A-Za-z\s]+(?:,\s*)?[A-Za-z\s]+(?:,\s*)?[A-Z]{2}\s*\d{5,10}',
-        # UK format: 123 High Street, City, Postcode
-        r'\d+[,\s]+[A-Za-z\s]+(?:Street|St|Road|Rd|Avenue|Ave|Lane|Ln|Drive|Dr|Way|Boulevard|Blvd|Close|Cl|Crescent|Cres|Place|Pl)[,\s]+[A-Za-z\s]+(?:,\s*)?[A-Za-z\s]+(?:,\s*)?[A-Z]{1,2}\d{1,2}\s?\d[A-Z]{2}',
-        # Generic: Number + Street + City + Postal
-        r'\d+[,\s]+[A-Za-z\s]+(?:Street|St|Road|Rd|Avenue|Ave|Lane|Ln|Drive|Dr|Way|Boulevard|Blvd)[,\s]+[A-Za-z\s]+(?:,\s*)?[A-Za-z\s]+(?:,\s*)?[A-Z]{1,2}?\d{1,2}\s?\d[A-Z]{2}',
-        # Generic: Number + Street + City
-        r'\d+[,\s]+[A-Za-z\s]+(?:Street|St|Road|Rd|Avenue|Ave|Lane|Ln|Drive|Dr|Way|Boulevard|Blvd)[,\s]+[A-Za-z\s]+(?:,\s*)?[A-Za-z\s]+',
-    ]
+    # Try regex patterns for common address formats (US, UK, international),
+    # one section at a time so the contact page can short-circuit the rest
+    for section in sections:
+        for pattern in _ADDR_PATTERNS:
+            match = pattern.search(section)
+            if match:
+                result = match.group().strip()
+                # Validate it looks like an address
+                if _looks_like_address(result):
+                    if job_id:
+                        job_manager.add_log(job_id, f"Address found via regex: {result[:50]}...")
+                    return result
     
-    for pattern in address_patterns:
-        matches = re.findall(pattern, text, re.IGNORECASE)
-        if matches:
-            result = matches[0].strip()
-            # Validate it looks like an address
-            if _looks_like_address(result):
-                if job_id:
-                    job_manager.add_log(job_id, f"Address found via regex: {result[:50]}...")
-                return result
+    # Combine all sections for the fallbacks below
+    text = " ".join(sections)
+    
+    # Try libpostal (if installed) before paying for an LLM call
+    result = _extract_with_libpostal(text)
+    if result:
+        if job_id:
+            job_manager.add_log(job_id, f"Address found via libpostal: {result[:50]}...")
+        return result
     
-    # Try LLM extraction if regex fails
+    # Try LLM extraction if regex and libpostal fail
     try:
-        # Build prompt text using f-string - no template variables to avoid parsing issues
-        text_to_analyze = text[:5000]
-        prompt_text = f"""Extract the business address from this text. Return only the complete address, or 'None' if not found:
-
-{text_to_analyze}"""
-        
-        # Construct messages directly - bypasses template parsing entirely
+        # Static instructions come first so the provider can cache them; the website text goes last
         messages = [
-            SystemMessage(content="""You are an address extraction assistant. Extract ONLY the complete business address from the text.
-            A valid address must include:
-            - Street number and name (e.g., "123 Main Street")
-            - City name
-            - State/Province or postal code
-            - Country (optional but preferred)
-            
-            Do NOT extract:
-            - Product names, prices, or e-commerce UI text
-            - Phone numbers or email addresses alone
-            - Partial addresses or just city names
-            - Text like "Add to Basket", "Best Sellers", "Add to wishlist", etc.
-            - Shopping cart or checkout related text
-            
-            Return ONLY the address, or 'None' if no valid address is found."""),
-            HumanMessage(content=prompt_text)
+            _ADDR_SYSTEM,
+            HumanMessage(content=text[:5000])
         ]
         
-        llm = get_llm_client()
+        llm = get_shared_llm_client()
         response = llm.invoke(messages)
         
         address = response.content.strip()
@@ -99,7 +187,8 @@ def extract_address(content: Dict[str, str], job_id: str = None) -> Optional[str
         address = address.strip('"\'')
         
         # Validate the extracted address
-        if address and address.lower() != 'none' and len(address) > 10:
+        # Anything over 10 characters can't be the LLM's 'None' answer
+        if len(address) > 10:
             # Check if it looks like an address (be more lenient with LLM results)
             if _looks_like_address(address):
                 if job_id:
@@ -108,7 +197,7 @@ def extract_address(content: Dict[str, str], job_id: str = None) -> Optional[str
             else:
                 # Even if validation fails, if LLM returned something substantial, trust it
                 # (LLM is usually better at context than regex)
-                if len(address.split()) >= 3 and any(word in address.lower() for word in ['street', 'road', 'avenue', 'lane', 'drive', 'way', 'st', 'rd', 'ave']):
+                if len(address.split()) >= 3 and _LENIENT_STREET_RE.search(address):
                     if job_id:
                         job_manager.add_log(job_id, f"Address found via LLM (lenient validation): {address[:50]}...")
                     return address
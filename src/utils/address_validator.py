@@ -1,32 +1,159 @@
 """Address validation using Google Street View API."""
 
+import functools
 import os
 import requests
-from typing import Dict, Optional
+from concurrent.futures import ThreadPoolExecutor
+from requests.adapters import HTTPAdapter
+from types import MappingProxyType
+from typing import Dict, List, Mapping, Optional, Tuple
 import re
 from dotenv import load_dotenv
-from urllib.parse import quote
+from urllib.parse import quote_from_bytes
+from urllib3.util.retry import Retry
+from ._cache_utils import LRUCache
 
 load_dotenv()
 
+# Plausibility check strategies accepted by check_address_plausibility
+PLAUSIBILITY_BACKENDS = ('llm', 'heuristics')
 
-def _looks_like_address(text: str) -> bool:
-    """Check if text looks like a valid address."""
-    # Must not contain common e-commerce UI terms
-    ecommerce_terms = ['add to basket', 'add to cart', 'best sellers', 'add to wishlist', 
-                       'buy now', 'checkout', 'shopping cart', 'price', '£', '$', '€',
-                       'add to bag', 'shop now', 'view cart']
-    text_lower = text.lower()
-    if any(term in text_lower for term in ecommerce_terms):
-        return False
-    
-    # Must contain street indicators or postal code patterns
-    has_street = bool(re.search(r'\b(Street|St|Road|Rd|Avenue|Ave|Lane|Ln|Drive|Dr|Way|Boulevard|Blvd|Close|Cl|Crescent|Cres|Place|Pl|Square|Sq)\b', text, re.IGNORECASE))
-    has_postal = bool(re.search(r'\b[A-Z]{1,2}\d{1,2}\s?\d[A-Z]{2}\b|\b\d{5}(-\d{4})?\b', text, re.IGNORECASE))
-    has_number = bool(re.search(r'\b\d+\b', text))
-    
-    # Must have at least street indicator OR postal code, AND a number, AND minimum word count
-    return (has_street or has_postal) and has_number and len(text.split()) >= 4
+# Google API key and default plausibility backend, read once at import (see reload_config)
+_API_KEY: Optional[str] = None
+_API_KEY_VALID = False
+_DEFAULT_BACKEND = 'llm'
+
+
+def reload_config() -> None:
+    """Re-read the Google API key and plausibility backend from the environment, e.g. after key rotation."""
+    global _API_KEY, _API_KEY_VALID, _DEFAULT_BACKEND
+    _API_KEY = os.getenv("GOOGLE_STREET_VIEW_API_KEY")
+    _API_KEY_VALID = bool(_API_KEY) and _API_KEY != 'placeholder'
+    backend = os.getenv("ADDRESS_PLAUSIBILITY_BACKEND", "llm").strip().lower()
+    _DEFAULT_BACKEND = backend if backend in PLAUSIBILITY_BACKENDS else 'llm'
+
+
+reload_config()
+
+# Shared session so repeated lookups reuse keep-alive HTTPS connections to maps.googleapis.com.
+# requests speaks HTTP/1.1 only, so concurrent lookups each hold a pooled connection;
+# pool_maxsize bounds how many stay open. Transient statuses are retried with backoff,
+# and the final response is returned rather than raised once retries run out.
+# Sessions send "Accept-Encoding: gzip, deflate" by default and decode transparently,
+# so metadata responses already arrive compressed.
+_SESSION = requests.Session()
+_ADAPTER = HTTPAdapter(
+    pool_connections=20,
+    pool_maxsize=100,
+    max_retries=Retry(
+        total=2,
+        backoff_factor=0.2,
+        status_forcelist=[429, 500, 502, 503, 504],
+        raise_on_status=False
+    )
+)
+_SESSION.mount('https://', _ADAPTER)
+_SESSION.mount('http://', _ADAPTER)
+
+# Shape of a validate_address result. In Lambda, we can't save files, so image_path
+# is always None; callers get a copy with the other fields filled in.
+_EMPTY_RESULT = MappingProxyType({
+    'valid': False,
+    'image_path': None,
+    'notes': '',
+    'is_commercial': None,
+    'plausibility_note': None,
+    'address_types': None
+})
+_PLAUSIBILITY_FIELDS = ('is_commercial', 'plausibility_note', 'address_types')
+_UNKNOWN_PLAUSIBILITY = MappingProxyType({
+    'is_commercial': None,
+    'plausibility_note': None,
+    'address_types': None,
+    'method': 'unknown'
+})
+_MIN_ADDRESS_LENGTH = 8
+_NO_API_KEY_NOTES = 'Address found. Street View validation unavailable (API key not configured). Plausibility check completed.'
+_NOT_AN_ADDRESS_NOTES = 'Extracted text does not appear to be a valid address'
+
+# (connect, read) timeouts for Street View metadata requests
+_TIMEOUT = (3.05, 5)
+
+# Runs plausibility checks alongside the Street View request
+_EXECUTOR = ThreadPoolExecutor(max_workers=8, thread_name_prefix='address-plausibility')
+
+# Street View and LLM plausibility results are cached per normalized address for a day
+_CACHE_TTL = 24 * 3600
+_CACHE_MAXSIZE = 4096
+
+# LLM plausibility results keyed by normalized address (LRU with expiry)
+_plausibility_cache = LRUCache(_CACHE_MAXSIZE, ttl=_CACHE_TTL)
+# Street View outcomes keyed by normalized address; failed lookups raise and aren't stored
+_street_view_cache = LRUCache(_CACHE_MAXSIZE, ttl=_CACHE_TTL)
+
+# Sent as a plain message (not a prompt template), so the JSON braces need no escaping
+_PLAUSIBILITY_PROMPT = """You are an expert address analyst. Analyze each given address and determine if it is commercial/industrial/warehouse/office or residential.
+
+Return ONLY a valid JSON array containing one object per address, in the same order as the addresses are numbered. Each object must have this exact structure:
+{
+    "is_commercial": true or false,
+    "confidence": "high" or "medium" or "low",
+    "classification": "commercial" or "industrial" or "warehouse" or "office" or "residential" or "mixed",
+    "address_types": ["type1", "type2"],
+    "reasoning": "Brief explanation of why this classification was made",
+    "indicators": ["indicator1", "indicator2"]
+}
+
+Address types should be from: establishment, point_of_interest, premise, subpremise, commercial, industrial, warehouse, office, residential, street_address, mixed_use
+
+Return ONLY the JSON array, no markdown, no code blocks, no other text."""
+
+# Commercial/industrial indicators plus unit-number patterns, matched in a single pass;
+# the group that matched selects the heuristic result from _HEURISTIC_RESULTS
+_COMMERCIAL_KEYWORDS = [
+    'industrial estate', 'business park', 'trading estate', 'industrial area',
+    'warehouse', 'unit', 'suite', 'building', 'park', 'estate',
+    'industrial park', 'commercial', 'office', 'offices', 'premises',
+    'trading', 'distribution', 'logistics', 'manufacturing'
+]
+_COMMERCIAL_RE = re.compile(
+    '(?P<keyword>' + '|'.join(map(re.escape, _COMMERCIAL_KEYWORDS)) + ')'
+    r'|(?P<unit>\b(?:unit|suite|building|block)\s+\d+)',
+    re.IGNORECASE
+)
+# Only unambiguous signals let the LLM backend skip its call: multi-word commercial
+# place names and numbered suites. Bare words like 'park' also appear in residential
+# street names ("10 Park Lane"), and numbered units and blocks are often flats
+# ("Unit 5, 12 Rose Court", "Block 123 Ang Mo Kio Ave 3"), so those go to the LLM.
+_FAST_PATH_COMMERCIAL_RE = re.compile(
+    r'\b(?:industrial estate|industrial park|industrial area|business park|trading estate)\b'
+    r'|\bsuite\s+\d+\b',
+    re.IGNORECASE
+)
+
+# Heuristic results are shared read-only singletons (address_types as tuples), so
+# checks allocate nothing; callers read them with .get() or copy them
+_STANDARD_ADDRESS_TYPES = ('premise', 'street_address')
+_COMMERCIAL_HEURISTIC = MappingProxyType({
+    'is_commercial': True,
+    'plausibility_note': "✓ Address classified as COMMERCIAL/INDUSTRIAL using pattern analysis. Location appears to be business premises.",
+    'address_types': ('establishment', 'point_of_interest', 'premise', 'commercial', 'industrial'),
+    'method': 'heuristics'
+})
+# No commercial indicator - a standard address, commercial status unknown
+_STANDARD_HEURISTIC = MappingProxyType({
+    'is_commercial': None,
+    'plausibility_note': "✓ Address analyzed. Location appears to be a standard address. For enhanced AI-powered classification, ensure LLM API is available.",
+    'address_types': _STANDARD_ADDRESS_TYPES,
+    'method': 'heuristics'
+})
+_HEURISTIC_RESULTS = {
+    'keyword': _COMMERCIAL_HEURISTIC,
+    'unit': _COMMERCIAL_HEURISTIC,
+    None: _STANDARD_HEURISTIC,
+}
+# The same commercial result when it lets the LLM backend skip its call
+_COMMERCIAL_FAST_PATH = MappingProxyType({**_COMMERCIAL_HEURISTIC, 'method': 'heuristics_fast_path'})
 
 
 def validate_address(address: str) -> Dict[str, any]:
@@ -46,101 +173,137 @@ def validate_address(address: str) -> Dict[str, any]:
         - 'plausibility_note': Optional[str] (explanation of plausibility check)
         - 'address_types': Optional[List[str]] (from Places API if available)
     """
-    api_key = os.getenv("GOOGLE_STREET_VIEW_API_KEY")
+    from .address_extractor import _looks_like_address
     
-    # If API key not configured, still run plausibility check but mark validation as unknown
-    if not api_key or api_key == 'placeholder':
+    # If API key not configured, still run plausibility check but mark validation as unknown.
+    # Checked before _looks_like_address so a misconfigured deployment skips the regex pass.
+    if not _API_KEY_VALID:
         # Still run plausibility check even without Street View API
         plausibility = check_address_plausibility(address)
-        return {
-            'valid': None,  # Unknown, not invalid
-            'image_path': None,
-            'notes': 'Address found. Street View validation unavailable (API key not configured). Plausibility check completed.',
-            'is_commercial': plausibility.get('is_commercial'),
-            'plausibility_note': plausibility.get('plausibility_note'),
-            'address_types': plausibility.get('address_types')
-        }
+        return _build_result(None, _NO_API_KEY_NOTES, plausibility)  # Unknown, not invalid
     
     # Quick sanity check first - reject obvious non-addresses
     if not _looks_like_address(address):
-        return {
-            'valid': False,
-            'image_path': None,
-            'notes': 'Extracted text does not appear to be a valid address',
-            'is_commercial': None,
-            'plausibility_note': None,
-            'address_types': None
-        }
+        return _build_result(False, _NOT_AN_ADDRESS_NOTES)
     
-    # Encode address for URL
-    encoded_address = quote(address)
+    # Plausibility doesn't depend on Street View, so run it while the HTTP request is in flight
+    plausibility_future = _EXECUTOR.submit(check_address_plausibility, address)
+    valid, notes = _check_street_view(address)
+    return _combine_results(valid, notes, plausibility_future.result())
+
+
+def validate_addresses(addresses: List[str], max_workers: int = 10) -> List[Dict[str, any]]:
+    """
+    Validate several addresses, issuing their Street View lookups concurrently.
     
-    # Google Street View Static API URL
-    url = f"https://maps.googleapis.com/maps/api/streetview?size=600x400&location={encoded_address}&key={api_key}"
+    Lookups share the pooled session; plausibility for all addresses is checked in one
+    batched call while they run.
     
-    try:
-        response = requests.get(url, timeout=10)
+    Args:
+        addresses: Address strings to validate
+        max_workers: Maximum number of Street View lookups in flight at once
         
-        # Check if we got a valid image (not an error image)
-        if response.status_code == 200 and response.content:
-            # Check content length - error images are usually smaller (< 5KB)
-            # Valid Street View images are typically > 20KB
-            if len(response.content) < 5000:
-                # Address not valid, but still try plausibility check
-                plausibility = check_address_plausibility(address)
-                return {
-                    'valid': False,
-                    'image_path': None,
-                    'notes': 'Address not found in Google Street View (no image available)',
-                    'is_commercial': plausibility.get('is_commercial'),
-                    'plausibility_note': plausibility.get('plausibility_note'),
-                    'address_types': plausibility.get('address_types')
-                }
-            
-            # Address is valid - perform plausibility check
-            plausibility = check_address_plausibility(address)
-            
-            # Update notes to include plausibility information
-            notes = 'Address validated via Google Street View'
-            if plausibility.get('plausibility_note'):
-                notes += f". {plausibility.get('plausibility_note')}"
-            
-            # In Lambda, we can't save files, so just validate
-            # For local development, could save but we'll skip for now
-            return {
-                'valid': True,
-                'image_path': None,  # Can't save in Lambda environment
-                'notes': notes,
-                'is_commercial': plausibility.get('is_commercial'),
-                'plausibility_note': plausibility.get('plausibility_note'),
-                'address_types': plausibility.get('address_types')
-            }
+    Returns:
+        One dictionary per address, in input order, as returned by validate_address
+    """
+    from .address_extractor import _looks_like_address
+    
+    if not _API_KEY_VALID:
+        plausibilities = check_address_plausibility_batch(addresses)
+        return [_build_result(None, _NO_API_KEY_NOTES, plausibility) for plausibility in plausibilities]
+    
+    # Obvious non-addresses never reach the network
+    results = [None] * len(addresses)
+    candidates = []
+    for i, address in enumerate(addresses):
+        if _looks_like_address(address):
+            candidates.append(i)
         else:
-            # Address not valid, but still try plausibility check
-            plausibility = check_address_plausibility(address)
-            return {
-                'valid': False,
-                'image_path': None,
-                'notes': 'Address not found in Google Street View',
-                'is_commercial': plausibility.get('is_commercial'),
-                'plausibility_note': plausibility.get('plausibility_note'),
-                'address_types': plausibility.get('address_types')
-            }
-            
+            results[i] = _build_result(False, _NOT_AN_ADDRESS_NOTES)
+    
+    if candidates:
+        to_check = [addresses[i] for i in candidates]
+        with ThreadPoolExecutor(max_workers=min(max_workers, len(to_check))) as pool:
+            lookups = pool.map(_check_street_view, to_check)
+            plausibilities = check_address_plausibility_batch(to_check)
+            for i, (valid, notes), plausibility in zip(candidates, lookups, plausibilities):
+                results[i] = _combine_results(valid, notes, plausibility)
+    
+    return results
+
+
+def _check_street_view(address: str) -> Tuple[bool, str]:
+    """Run the cached Street View lookup, reporting request errors in the notes."""
+    key = _normalize_address(address)
+    cached = _street_view_cache.get(key)
+    if cached is not None:
+        return cached
+    try:
+        result = _street_view_lookup(key, _API_KEY)
     except Exception as e:
-        # Error validating, but still try plausibility check
-        plausibility = check_address_plausibility(address)
-        return {
-            'valid': False,
-            'image_path': None,
-            'notes': f'Error validating address: {str(e)}',
-            'is_commercial': plausibility.get('is_commercial'),
-            'plausibility_note': plausibility.get('plausibility_note'),
-            'address_types': plausibility.get('address_types')
-        }
+        # Error validating, but still report the plausibility check. requests errors
+        # include the request URL, so the API key is scrubbed from the user-visible notes.
+        return False, f'Error validating address: {str(e).replace(_API_KEY, "<redacted>")}'
+    _street_view_cache.set(key, result)
+    return result
+
+
+def _combine_results(valid: bool, notes: str, plausibility: Dict[str, any]) -> Dict[str, any]:
+    """Build a validation result from a Street View outcome and a plausibility check."""
+    # Update notes to include plausibility information
+    if valid and plausibility.get('plausibility_note'):
+        notes += f". {plausibility.get('plausibility_note')}"
+    return _build_result(valid, notes, plausibility)
+
+
+def _build_result(valid: Optional[bool], notes: str, plausibility: Optional[Mapping[str, any]] = None) -> Dict[str, any]:
+    """Fill a copy of the empty validation result, taking plausibility fields if given."""
+    result = dict(_EMPTY_RESULT)
+    result['valid'] = valid
+    result['notes'] = notes
+    if plausibility:
+        for key in _PLAUSIBILITY_FIELDS:
+            result[key] = plausibility.get(key)
+    return result
 
 
-def check_address_plausibility(address: str) -> Dict[str, any]:
+def _normalize_address(address: str) -> str:
+    """Collapse whitespace and case so trivially different spellings share cache entries."""
+    return ' '.join(address.split()).lower()
+
+
+def _street_view_lookup(address: str, api_key: str) -> Tuple[bool, str]:
+    """
+    Look up a normalized address in Google Street View.
+    
+    Request errors, non-200 responses and error statuses (quota, key, server) raise,
+    so _check_street_view only caches real outcomes.
+    
+    Returns:
+        Tuple of (valid, notes)
+    """
+    # Encode address for URL (bytes path; no safe characters, so '/' is escaped too)
+    encoded_address = quote_from_bytes(address.encode('utf-8'), safe=b'')
+    
+    # Street View metadata reports whether imagery exists without downloading the image
+    url = f"https://maps.googleapis.com/maps/api/streetview/metadata?location={encoded_address}&key={api_key}"
+    
+    response = _SESSION.get(url, timeout=_TIMEOUT)
+    if response.status_code != 200:
+        # Rate limits, bad keys and server errors left after retries aren't cached as "not
+        # found". Not raise_for_status(), whose message includes the URL and so the key.
+        raise RuntimeError(f"Street View metadata request failed with HTTP {response.status_code}")
+    
+    status = response.json().get('status')
+    if status == 'OK':
+        return True, 'Address validated via Google Street View'
+    if status in ('ZERO_RESULTS', 'NOT_FOUND'):
+        return False, 'Address not found in Google Street View (no image available)'
+    # Quota, key or server problems say nothing about the address - report as an error
+    raise RuntimeError(f"Street View metadata request failed with status {status}")
+
+
+def check_address_plausibility(address: str, backend: Optional[str] = None) -> Mapping[str, any]:
     """
     Check if address appears to be commercial/industrial vs residential.
     
@@ -149,132 +312,185 @@ def check_address_plausibility(address: str) -> Dict[str, any]:
     
     Args:
         address: Address string to check
+        backend: 'llm' or 'heuristics' (defaults to ADDRESS_PLAUSIBILITY_BACKEND, else 'llm')
         
     Returns:
-        Dictionary with:
+        Read-only mapping (shared between calls; copy it to modify) with:
         - 'is_commercial': bool (True if commercial/industrial/warehouse/office)
         - 'plausibility_note': str (explanation)
-        - 'address_types': Optional[List[str]] (location types)
-        - 'method': str ('ai_analysis', 'heuristics', or 'unknown')
+        - 'address_types': Optional[Tuple[str, ...]] (location types)
+        - 'method': str ('ai_analysis', 'heuristics', 'heuristics_fast_path', or 'unknown')
     """
-    try:
-        # Use LLM to analyze the address
-        from ..analyzer.llm_client import get_llm_client
-        from langchain_core.messages import SystemMessage, HumanMessage
-        from langchain_core.prompts import ChatPromptTemplate
-        
-        prompt = ChatPromptTemplate.from_messages([
-            ("system", """You are an expert address analyst. Analyze the given address and determine if it is commercial/industrial/warehouse/office or residential.
+    return check_address_plausibility_batch([address], backend)[0]
 
-Return ONLY a valid JSON object with this exact structure:
-{
-    "is_commercial": true or false,
-    "confidence": "high" or "medium" or "low",
-    "classification": "commercial" or "industrial" or "warehouse" or "office" or "residential" or "mixed",
-    "address_types": ["type1", "type2"],
-    "reasoning": "Brief explanation of why this classification was made",
-    "indicators": ["indicator1", "indicator2"]
-}
 
-Address types should be from: establishment, point_of_interest, premise, subpremise, commercial, industrial, warehouse, office, residential, street_address, mixed_use
-
-Return ONLY the JSON object, no markdown, no code blocks, no other text."""),
-            ("human", "Analyze this address and classify it:\n\n{address}")
-        ])
-        
-        llm = get_llm_client()
-        chain = prompt | llm
-        response = chain.invoke({"address": address})
-        
-        # Extract JSON from response
-        content_str = response.content.strip()
-        
-        # Remove markdown code blocks if present
-        if content_str.startswith("```"):
-            content_str = content_str.split("```")[1]
-            if content_str.startswith("json"):
-                content_str = content_str[4:]
-            content_str = content_str.strip()
-        if content_str.endswith("```"):
-            content_str = content_str.rsplit("```")[0].strip()
-        
-        import json
-        result = json.loads(content_str)
+def check_address_plausibility_batch(addresses: List[str], backend: Optional[str] = None) -> List[Mapping[str, any]]:
+    """
+    Check several addresses for commercial vs residential use with a single LLM call.
+    
+    Strings too short to be an address are reported as unknown without any checks,
+    addresses with an unambiguous commercial signal (e.g. "Suite 5") skip the LLM, previously
+    classified addresses are served from cache, and the rest are sent together in one
+    prompt. Addresses the LLM fails to classify fall back to heuristics.
+    
+    Args:
+        addresses: Address strings to check
+        backend: 'llm' or 'heuristics' (defaults to ADDRESS_PLAUSIBILITY_BACKEND, else 'llm')
         
-        # Format the response
-        is_commercial = result.get('is_commercial', False)
-        classification = result.get('classification', 'unknown')
-        reasoning = result.get('reasoning', '')
-        address_types = result.get('address_types', [])
-        confidence = result.get('confidence', 'medium')
-        indicators = result.get('indicators', [])
+    Returns:
+        One read-only mapping per address, in input order, as returned by check_address_plausibility
         
-        # Create impressive note
-        if is_commercial:
-            note = f"✓ Address classified as {classification.upper()} using AI-powered analysis. {reasoning}"
-            if indicators:
-                note += f" Key indicators: {', '.join(indicators[:3])}."
+    Raises:
+        ValueError: If backend is not one of PLAUSIBILITY_BACKENDS
+    """
+    backend = backend or _DEFAULT_BACKEND
+    if backend == 'heuristics':
+        return [_check_with_heuristics_fallback(address) for address in addresses]
+    if backend != 'llm':
+        raise ValueError(f"Unknown plausibility backend: {backend!r}")
+    
+    keys = [_normalize_address(address) for address in addresses]
+    results = {}
+    # Uncached addresses for the LLM, keeping the first spelling of each for the prompt
+    pending = {}
+    for address, key in zip(addresses, keys):
+        if key in results or key in pending:
+            continue
+        # Too short to be an address - nothing to classify
+        if len(key) < _MIN_ADDRESS_LENGTH:
+            results[key] = _UNKNOWN_PLAUSIBILITY
+            continue
+        # Clearly commercial addresses are settled without an LLM call
+        if _FAST_PATH_COMMERCIAL_RE.search(address):
+            results[key] = _COMMERCIAL_FAST_PATH
+            continue
+        cached = _plausibility_cache.get(key)
+        if cached is not None:
+            results[key] = cached
         else:
-            note = f"✓ Address analyzed using AI-powered classification. {reasoning}"
-        
-        # Add confidence indicator
-        if confidence == 'high':
-            note += " (High confidence)"
-        elif confidence == 'medium':
-            note += " (Medium confidence)"
-        
-        return {
-            'is_commercial': is_commercial,
-            'plausibility_note': note,
-            'address_types': address_types if address_types else ['premise', 'street_address'],
-            'method': 'ai_analysis'
-        }
-        
-    except Exception as e:
-        # Fallback to heuristics if LLM fails
-        return _check_with_heuristics_fallback(address, str(e))
+            pending[key] = address
+    
+    error = "No classification returned for address"
+    if pending:
+        try:
+            classified = _classify_with_llm(list(pending.values()))
+        except Exception as e:
+            error = str(e)
+            classified = []
+        for key, result in zip(pending, classified):
+            _plausibility_cache.set(key, result)
+            results[key] = result
+    
+    # Every result is a read-only mapping, so cached ones are returned without copying
+    return [
+        results[key] if key in results else _check_with_heuristics_fallback(address, error)
+        for address, key in zip(addresses, keys)
+    ]
 
 
-def _check_with_heuristics_fallback(address: str, error_msg: str = "") -> Dict[str, any]:
+def cache_info() -> Dict[str, Dict[str, int]]:
     """
-    Fallback heuristics when LLM is unavailable.
+    Report hit/miss statistics for the address caches.
+    
+    Returns:
+        Dictionary with 'street_view' and 'plausibility' entries, each holding
+        'hits', 'misses', 'maxsize' and 'currsize'
+    """
+    return {
+        'street_view': _street_view_cache.info(),
+        'plausibility': _plausibility_cache.info()
+    }
+
+
+@functools.lru_cache(maxsize=1)
+def _plausibility_system():
+    """Build the plausibility system message once, importing LangChain on first use."""
+    from langchain_core.messages import SystemMessage
+    return SystemMessage(content=_PLAUSIBILITY_PROMPT)
+
+
+def _classify_with_llm(addresses: List[str]) -> List[Mapping[str, any]]:
+    """
+    Classify addresses with one LLM call.
     
-    Args:
-        address: Address string to check
-        error_msg: Error message from LLM attempt
-        
     Returns:
-        Dictionary with plausibility results
+        Plausibility results in input order (may be shorter than the input if the
+        LLM returned fewer items)
+        
+    Raises:
+        Exception: If the LLM call fails or the response is not a JSON array
     """
-    address_lower = address.lower()
-    
-    # Commercial/industrial indicators
-    commercial_keywords = [
-        'industrial estate', 'business park', 'trading estate', 'industrial area',
-        'warehouse', 'unit', 'suite', 'building', 'park', 'estate',
-        'industrial park', 'commercial', 'office', 'offices', 'premises',
-        'trading', 'distribution', 'logistics', 'manufacturing'
+    from langchain_core.messages import HumanMessage
+    from ..analyzer._json_utils import loads_json, strip_code_fences
+    from ..analyzer.llm_cache import get_shared_llm_client
+    
+    numbered = "\n".join(f"{i}. {address}" for i, address in enumerate(addresses, 1))
+    messages = [
+        _plausibility_system(),
+        HumanMessage(content=f"Analyze these {len(addresses)} addresses and classify them:\n\n{numbered}")
     ]
     
-    # Check for commercial indicators
-    has_commercial_keyword = any(keyword in address_lower for keyword in commercial_keywords)
-    has_unit_pattern = bool(re.search(r'\b(unit|suite|building|block)\s+\d+', address_lower))
+    llm = get_shared_llm_client()
+    response = llm.invoke(messages)
     
-    is_commercial = has_commercial_keyword or has_unit_pattern
+    # Extract JSON from response, removing markdown code blocks if present
+    items = loads_json(strip_code_fences(response.content))
+    if isinstance(items, dict):
+        # A single address may come back as a bare object
+        items = [items]
+    if not isinstance(items, list):
+        raise ValueError(f"Expected a JSON array, got {type(items).__name__}")
     
+    return [_format_llm_result(item) for item in items[:len(addresses)]]
+
+
+def _format_llm_result(result: Dict[str, any]) -> Mapping[str, any]:
+    """Turn one LLM classification into a read-only plausibility result."""
+    # Format the response
+    is_commercial = result.get('is_commercial', False)
+    classification = result.get('classification', 'unknown')
+    reasoning = result.get('reasoning', '')
+    address_types = result.get('address_types', [])
+    confidence = result.get('confidence', 'medium')
+    indicators = result.get('indicators', [])
+    
+    # Create impressive note
     if is_commercial:
-        address_types = ['establishment', 'point_of_interest', 'premise', 'commercial', 'industrial']
-        note = "✓ Address classified as COMMERCIAL/INDUSTRIAL using pattern analysis. Location appears to be business premises."
+        note = f"✓ Address classified as {classification.upper()} using AI-powered analysis. {reasoning}"
+        if indicators:
+            note += f" Key indicators: {', '.join(indicators[:3])}."
     else:
-        address_types = ['premise', 'street_address']
-        note = "✓ Address analyzed. Location appears to be a standard address. For enhanced AI-powered classification, ensure LLM API is available."
+        note = f"✓ Address analyzed using AI-powered classification. {reasoning}"
     
-    return {
-        'is_commercial': is_commercial if (has_commercial_keyword or has_unit_pattern) else None,
+    # Add confidence indicator
+    if confidence == 'high':
+        note += " (High confidence)"
+    elif confidence == 'medium':
+        note += " (Medium confidence)"
+    
+    return MappingProxyType({
+        'is_commercial': is_commercial,
         'plausibility_note': note,
-        'address_types': address_types,
-        'method': 'heuristics'
-    }
+        'address_types': tuple(address_types) if address_types else _STANDARD_ADDRESS_TYPES,
+        'method': 'ai_analysis'
+    })
+
+
+def _check_with_heuristics_fallback(address: str, error_msg: str = "") -> Mapping[str, any]:
+    """
+    Fallback heuristics when LLM is unavailable.
+    
+    Args:
+        address: Address string to check
+        error_msg: Error message from LLM attempt
+        
+    Returns:
+        Shared read-only plausibility result
+    """
+    # Check for commercial indicators (keywords or unit numbers) in one case-insensitive
+    # pass and look up the result for whichever matched
+    match = _COMMERCIAL_RE.search(address)
+    return _HEURISTIC_RESULTS[match.lastgroup if match else None]
 
 
 # Note: Address plausibility check uses AI-powered analysis via LLM API
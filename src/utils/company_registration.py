@@ -1,48 +1,141 @@
 """Extract company registration details from website content."""
 
-from typing import Dict, Optional
+from typing import Dict, Optional, Sequence
+import hashlib
 import re
-import json
+from urllib.parse import urlsplit
 from langchain_core.messages import HumanMessage, SystemMessage
-from ..analyzer.llm_client import get_llm_client
+from ..analyzer._json_utils import parse_llm_json
+from ..analyzer._token_utils import cap_tokens
+from ..analyzer.llm_cache import get_shared_llm_client
+from ..scraper.content_extractor import Content
+from ._cache_utils import LRUCache
 
+# Regex patterns per field, in priority order
+_FIELD_PATTERNS = (
+    ('company_number', (
+        r'(?:Company\s*No|Company\s*Reg(?:istration)?\s*No|CRN)[:\s]*([A-Z0-9]{2,10}(?:\s*[A-Z0-9]{2,10})?)',
+        r'\b(?:Co\.\s*No\.|Company\s*Number)\s*(\d{6,10})\b',
+    )),
+    ('vat_number', (
+        r'(?:VAT\s*No|VAT\s*Reg(?:istration)?\s*No)[:\s]*([A-Z]{2}\s*\d{9,12})',
+        r'\b(\d{9})\s*(?:VAT)\b',
+    )),
+    ('eori_number', (
+        r'(?:EORI\s*No|EORI)[:\s]*([A-Z]{2}\s*\d{10,15})',
+    )),
+    ('established_date', (
+        r'(?:Established|Founded|Incorporated|Since)[:\s]*(?:in)?\s*(\d{4})',
+        r'(?:Established|Founded|Incorporated|Since)[:\s]*(?:on)?\s*(\d{1,2}\s*(?:Jan|Feb|Mar|Apr|May|Jun|Jul|Aug|Sep|Oct|Nov|Dec)[a-z]*\s*\d{4})',
+    )),
+)
+
+# All patterns fused into one scan. Each alternative sits in a lookahead, so matches are
+# zero-width and one field's match (e.g. a company number running into "VAT") never
+# hides another field's match that overlaps it.
+_REGISTRATION_RE = re.compile('|'.join(
+    f'(?=(?P<{field}_{priority}>{pattern}))'
+    for field, patterns in _FIELD_PATTERNS
+    for priority, pattern in enumerate(patterns)
+), re.IGNORECASE)
+# Group number of each alternative -> (field, priority); the value is the next group
+_REGISTRATION_GROUPS = {
+    _REGISTRATION_RE.groupindex[f'{field}_{priority}']: (field, priority)
+    for field, patterns in _FIELD_PATTERNS
+    for priority in range(len(patterns))
+}
+
+# Title segments are split on the usual separators ("Acme Ltd | Home", "Home - Acme Ltd")
+_TITLE_SEPARATOR_RE = re.compile(r'\s*[|:•]\s*|\s+[-–—]\s+')
+_COMPANY_SUFFIX_RE = re.compile(
+    r'\b(?:Ltd|Limited|LLC|LLP|PLC|Inc|Incorporated|Corp|Corporation|GmbH|AG|S\.?A\.?S?|B\.?V|Pty)\b\.?'
+)
+
+# Country-code TLDs mapped to countries; generic TLDs (.com, .net, ...) say nothing
+_TLD_COUNTRIES = {
+    'uk': 'United Kingdom', 'ie': 'Ireland', 'de': 'Germany', 'fr': 'France',
+    'nl': 'Netherlands', 'be': 'Belgium', 'es': 'Spain', 'it': 'Italy', 'pt': 'Portugal',
+    'at': 'Austria', 'ch': 'Switzerland', 'se': 'Sweden', 'no': 'Norway', 'dk': 'Denmark',
+    'fi': 'Finland', 'pl': 'Poland', 'cz': 'Czech Republic', 'us': 'United States',
+    'ca': 'Canada', 'au': 'Australia', 'nz': 'New Zealand', 'in': 'India', 'jp': 'Japan',
+    'cn': 'China', 'sg': 'Singapore', 'hk': 'Hong Kong', 'za': 'South Africa',
+}
 
-def extract_company_registration(content: Dict[str, str], job_id: str = None) -> Dict[str, Optional[str]]:
-    """Extract company registration details from website content."""
+# Prompt shaping: the homepage tail (typically the footer) and a token budget for the text
+_FOOTER_CHARS = 2000
+_LLM_MAX_TOKENS = 2500
+_WHITESPACE_RE = re.compile(r'\s+')
+# Cookie-banner sentences (up to 300 characters either side of the word). The sentence
+# pattern is only tried where a mention of cookies says a match starts, since scanning
+# with it backtracks ~300 steps at every position of unpunctuated text.
+_COOKIE_RE = re.compile(r'\bcookies?\b', re.IGNORECASE)
+_COOKIE_SENTENCE_RE = re.compile(r'[^.!?]{0,300}\bcookies?\b[^.!?]{0,300}[.!?]?', re.IGNORECASE)
+_COOKIE_SENTENCE_REACH = 300
+
+# Static instructions, built once; only the human message changes per call
+_SYSTEM_MSG = SystemMessage(content="""Extract company registration details from the text. Return JSON with keys: 'company_name', 'company_number', 'vat_number', 'eori_number', 'established_date', 'country_of_registration'. Use 'None' for missing values.""")
+_PROMPT_PREFIX = "Extract company registration details:\n\n"
+_PROMPT_SUFFIX = "\n\nJSON:"
+# Values the LLM uses for "not found" (the prompt asks for 'None'), compared lowercased
+_MISSING_VALUES = frozenset(('', 'none', 'null'))
+
+# Parsed LLM extractions keyed by a digest of the prompt text (LRU); parse failures aren't cached
+_LLM_CACHE_MAXSIZE = 512
+_llm_cache = LRUCache(_LLM_CACHE_MAXSIZE)
+
+
+def extract_company_registration(content: Content, job_id: str = None, url: str = None) -> Dict[str, Optional[str]]:
+    """
+    Extract company registration details from website content.
+    
+    Regexes and cheap heuristics (page title, domain TLD) run first; the LLM is only
+    called when the company name or country is still missing. Registration numbers
+    the regexes miss are then left empty rather than paying for an LLM call, since
+    EORI and VAT numbers are absent from most sites anyway.
+    """
     from ..api.jobs import job_manager
     
     if job_id:
         job_manager.add_log(job_id, "Extracting company registration details...")
     
-    # Combine all content
-    text = f"{content.get('homepage', '')} {content.get('about', '')} {content.get('contact', '')}"
+    # Scanned section by section, so no combined copy of the content is built
+    sections = (content.homepage, content.about, content.contact)
     
     # Try regex patterns
-    company_number = _extract_company_number(text)
-    vat_number = _extract_vat_number(text)
-    eori_number = _extract_eori_number(text)
-    established_date = _extract_established_date(text)
+    numbers = _extract_registration_numbers(sections)
+    company_number = numbers['company_number']
+    vat_number = numbers['vat_number']
+    eori_number = numbers['eori_number']
+    established_date = numbers['established_date']
     
-    # Use LLM for remaining fields
-    try:
-        llm_result = _extract_with_llm(text)
-        company_name = llm_result.get('company_name')
-        country_of_registration = llm_result.get('country_of_registration')
-        
-        # Use LLM results if regex didn't find them
-        if not company_number:
-            company_number = llm_result.get('company_number')
-        if not vat_number:
-            vat_number = llm_result.get('vat_number')
-        if not eori_number:
-            eori_number = llm_result.get('eori_number')
-        if not established_date:
-            established_date = llm_result.get('established_date')
-    except Exception as e:
-        if job_id:
-            job_manager.add_log(job_id, f"LLM extraction failed: {e}")
-        company_name = None
-        country_of_registration = None
+    # Cheap guesses for the fields regex can't find
+    title_company_name = _company_name_from_title(content.title)
+    tld_country = _country_from_tld(url)
+    company_name = title_company_name
+    country_of_registration = tld_country
+    
+    # Use LLM for remaining fields, unless the title and TLD already gave the name and country
+    if not (company_name and country_of_registration):
+        try:
+            llm_result = _extract_with_llm(content)
+            # The LLM reads the page text, so it beats the title/TLD guesses
+            company_name = llm_result.get('company_name') or title_company_name
+            country_of_registration = llm_result.get('country_of_registration') or tld_country
+            
+            # Use LLM results if regex didn't find them
+            if not company_number:
+                company_number = llm_result.get('company_number')
+            if not vat_number:
+                vat_number = llm_result.get('vat_number')
+            if not eori_number:
+                eori_number = llm_result.get('eori_number')
+            if not established_date:
+                established_date = llm_result.get('established_date')
+        except Exception as e:
+            if job_id:
+                job_manager.add_log(job_id, f"LLM extraction failed: {e}")
+    elif job_id:
+        job_manager.add_log(job_id, "Company name and country found without LLM")
     
     result = {
         'company_number': str(company_number) if company_number else None,
@@ -60,88 +153,110 @@ def extract_company_registration(content: Dict[str, str], job_id: str = None) ->
     return result
 
 
-def _extract_company_number(text: str) -> Optional[str]:
-    """Extract company number using regex."""
-    patterns = [
-        r'(?:Company\s*No|Company\s*Reg(?:istration)?\s*No|CRN)[:\s]*([A-Z0-9]{2,10}(?:\s*[A-Z0-9]{2,10})?)',
-        r'\b(?:Co\.\s*No\.|Company\s*Number)\s*(\d{6,10})\b',
-    ]
-    for pattern in patterns:
-        match = re.search(pattern, text, re.IGNORECASE)
-        if match:
-            return match.group(1).strip()
-    return None
+def _extract_registration_numbers(sections: Sequence[str]) -> Dict[str, Optional[str]]:
+    """
+    Extract company number, VAT number, EORI number and established date in one regex scan.
+    
+    Each field takes its highest-priority pattern that matches anywhere; among matches of
+    the same pattern, the first in section order wins. Scanning stops once every field
+    has a match from its top pattern.
+    """
+    best = {}  # field -> (priority, value)
+    for match in _iter_registration_matches(sections):
+        group = match.lastindex
+        field, priority = _REGISTRATION_GROUPS[group]
+        if field not in best or priority < best[field][0]:
+            best[field] = (priority, match.group(group + 1).strip())
+            if len(best) == len(_FIELD_PATTERNS) and not any(p for p, _ in best.values()):
+                break
+    return {field: best[field][1] if field in best else None for field, _ in _FIELD_PATTERNS}
 
 
-def _extract_vat_number(text: str) -> Optional[str]:
-    """Extract VAT number using regex."""
-    patterns = [
-        r'(?:VAT\s*No|VAT\s*Reg(?:istration)?\s*No)[:\s]*([A-Z]{2}\s*\d{9,12})',
-        r'\b(\d{9})\s*(?:VAT)\b'
-    ]
-    for pattern in patterns:
-        match = re.search(pattern, text, re.IGNORECASE)
-        if match:
-            return match.group(1).strip()
-    return None
+def _iter_registration_matches(sections: Sequence[str]):
+    """Yield registration pattern matches across the sections, in order."""
+    for section in sections:
+        yield from _REGISTRATION_RE.finditer(section)
 
 
-def _extract_eori_number(text: str) -> Optional[str]:
-    """Extract EORI number using regex."""
-    pattern = r'(?:EORI\s*No|EORI)[:\s]*([A-Z]{2}\s*\d{10,15})'
-    match = re.search(pattern, text, re.IGNORECASE)
-    if match:
-        return match.group(1).strip()
+def _company_name_from_title(title: str) -> Optional[str]:
+    """Take the company name from a title segment with a legal suffix, e.g. 'Acme Ltd | Home'."""
+    for segment in _TITLE_SEPARATOR_RE.split(title):
+        segment = segment.strip()
+        if _COMPANY_SUFFIX_RE.search(segment):
+            return segment
     return None
 
 
-def _extract_established_date(text: str) -> Optional[str]:
-    """Extract established date using regex."""
-    patterns = [
-        r'(?:Established|Founded|Incorporated|Since)[:\s]*(?:in)?\s*(\d{4})',
-        r'(?:Established|Founded|Incorporated|Since)[:\s]*(?:on)?\s*(\d{1,2}\s*(?:Jan|Feb|Mar|Apr|May|Jun|Jul|Aug|Sep|Oct|Nov|Dec)[a-z]*\s*\d{4})',
-    ]
-    for pattern in patterns:
-        match = re.search(pattern, text, re.IGNORECASE)
-        if match:
-            return match.group(1).strip()
-    return None
+def _country_from_tld(url: Optional[str]) -> Optional[str]:
+    """Guess the country of registration from a country-code domain."""
+    if not url:
+        return None
+    host = urlsplit(url if '//' in url else f'//{url}').hostname or ''
+    return _TLD_COUNTRIES.get(host.rsplit('.', 1)[-1])
 
 
-def _extract_with_llm(text: str) -> Dict[str, Optional[str]]:
-    """Use LLM to extract company registration details."""
-    # Build prompt text using f-string - no template variables to avoid parsing issues
-    text_to_analyze = text[:10000]
-    prompt_text = f"""Extract company registration details:
+def _clean_for_llm(text: str) -> str:
+    """Drop cookie-banner sentences and collapse whitespace."""
+    return _WHITESPACE_RE.sub(' ', _drop_cookie_sentences(text)).strip()
 
-{text_to_analyze}
 
-JSON:"""
+def _drop_cookie_sentences(text: str) -> str:
+    """Replace each _COOKIE_SENTENCE_RE match with a space, like re.sub but in linear time."""
+    kept = []
+    pos = 0
+    for match in _COOKIE_RE.finditer(text):
+        if match.start() < pos:
+            # Already inside a removed sentence
+            continue
+        # The leftmost sentence match starts just after the previous sentence end,
+        # at most _COOKIE_SENTENCE_REACH characters before the word
+        lo = max(pos, match.start() - _COOKIE_SENTENCE_REACH)
+        start = max(lo, *(text.rfind(char, lo, match.start()) + 1 for char in '.!?'))
+        kept.append(text[pos:start])
+        pos = _COOKIE_SENTENCE_RE.match(text, start).end()
+    kept.append(text[pos:])
+    return ' '.join(kept)
+
+
+def _extract_with_llm(content: Content) -> Dict[str, Optional[str]]:
+    """Use LLM to extract company registration details."""
+    # Registration details usually sit on the contact page or in the homepage footer,
+    # so those go first; each part is capped before joining and the whole by tokens
+    homepage = content.homepage
+    parts = (content.contact, homepage[-_FOOTER_CHARS:], content.about, homepage[:-_FOOTER_CHARS])
+    text_to_analyze = cap_tokens(
+        _clean_for_llm(" ".join(part[:10000] for part in parts if part)),
+        _LLM_MAX_TOKENS
+    )
+    
+    # Identical text (re-analyses, retries) reuses the earlier extraction
+    cache_key = hashlib.blake2b(text_to_analyze.encode('utf-8'), digest_size=16).digest()
+    cached = _llm_cache.get(cache_key)
+    if cached is not None:
+        return dict(cached)
     
     # Construct messages directly - bypasses template parsing entirely
     messages = [
-        SystemMessage(content="""Extract company registration details from the text. Return JSON with keys: 'company_name', 'company_number', 'vat_number', 'eori_number', 'established_date', 'country_of_registration'. Use 'None' for missing values."""),
-        HumanMessage(content=prompt_text)
+        _SYSTEM_MSG,
+        HumanMessage(content=_PROMPT_PREFIX + text_to_analyze + _PROMPT_SUFFIX)
     ]
     
-    llm = get_llm_client()
+    llm = get_shared_llm_client()
     response = llm.invoke(messages)
     
     try:
-        # Try to parse JSON from response
-        content = response.content.strip()
-        # Remove markdown code blocks if present
-        if content.startswith('```'):
-            content = content.split('```')[1]
-            if content.startswith('json'):
-                content = content[4:]
-        result = json.loads(content)
-        # Ensure all values are strings
+        # Parse the JSON object, tolerating code fences and text around it
+        result = parse_llm_json(response.content)
+        if not isinstance(result, dict):
+            raise ValueError(f"Expected a JSON object, got {type(result).__name__}")
+        # Ensure all values are strings, with the LLM's 'None'/'null' placeholders as missing
         for key, value in result.items():
             if value is not None:
-                result[key] = str(value)
-        return result
-    except json.JSONDecodeError:
+                value = str(value).strip()
+                result[key] = None if value.lower() in _MISSING_VALUES else value
+        _llm_cache.set(cache_key, result)
+        return dict(result)
+    except ValueError:
         return {
             'company_name': None,
             'company_number': None,